@@ -5,17 +5,40 @@ Auto-Guardian: Smart Code Analyzer
 This script analyzes code to detect various issues
 """
 
+import ast
+import hashlib
 import json
+import mmap
 import os
 import re
 import subprocess
 import sys
+from array import array
+from bisect import bisect_right
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
+from functools import lru_cache, partial
 from pathlib import Path
 from typing import Optional
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import pathspec
+except ImportError:
+    pathspec = None
+
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
 
 class Severity(Enum):
     """Issue severity levels"""
@@ -40,7 +63,7 @@ class IssueType(Enum):
     IMPORT_ERROR = "import_error"
 
 
-@dataclass
+@dataclass(slots=True)
 class CodeIssue:
     """Representation of a code issue"""
     file: str
@@ -66,9 +89,27 @@ class CodeIssue:
             "suggestion": self.suggestion,
             "fixable": self.fixable
         }
+    
+    @classmethod
+    def from_dict(cls, data: dict) -> "CodeIssue":
+        """Build issue from its dictionary form"""
+        # Paths, rule ids and scanner messages repeat across many issues,
+        # so share one copy of each instead of one per issue
+        rule_id = data.get("rule_id")
+        return cls(
+            file=sys.intern(data["file"]),
+            line=data["line"],
+            column=data["column"],
+            severity=Severity(data["severity"]),
+            issue_type=IssueType(data["type"]),
+            message=sys.intern(data["message"]),
+            rule_id=sys.intern(rule_id) if rule_id else rule_id,
+            suggestion=data.get("suggestion"),
+            fixable=data.get("fixable", False)
+        )
 
 
-@dataclass
+@dataclass(slots=True)
 class ScanResult:
     """Complete scan result"""
     timestamp: str = field(default_factory=lambda: datetime.now().isoformat())
@@ -81,7 +122,7 @@ class ScanResult:
     issues: list = field(default_factory=list)
     
     def to_dict(self) -> dict:
-        """Convert result to dictionary"""
+        """Convert result to dictionary, leaving issues for _json_default to encode"""
         return {
             "timestamp": self.timestamp,
             "summary": {
@@ -92,219 +133,904 @@ class ScanResult:
                 "critical_count": len(self.critical_issues),
                 "auto_fixable_count": len(self.auto_fixable_issues)
             },
-            "critical_issues": [i.to_dict() for i in self.critical_issues],
-            "auto_fixable_issues": [i.to_dict() for i in self.auto_fixable_issues],
-            "all_issues": [i.to_dict() for i in self.issues]
+            "critical_issues": self.critical_issues,
+            "auto_fixable_issues": self.auto_fixable_issues,
+            "all_issues": self.issues
         }
 
 
+def _json_default(obj):
+    """Encode analyzer objects the JSON encoders don't handle natively"""
+    if isinstance(obj, CodeIssue):
+        return obj.to_dict()
+    if isinstance(obj, Enum):
+        return obj.value
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _dump_json(data, indent: bool = False) -> bytes:
+    """Serialize data to UTF-8 JSON, using orjson when available"""
+    if orjson is not None:
+        option = orjson.OPT_PASSTHROUGH_DATACLASS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(data, default=_json_default, option=option)
+    return json.dumps(data, indent=2 if indent else None, ensure_ascii=False,
+                      default=_json_default).encode('utf-8')
+
+
+def _load_json(data: bytes):
+    """Parse UTF-8 JSON, using orjson when available"""
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+# Security patterns: (regex, literal, description, severity, fixable)
+# The literal occurs in every match of the regex, so files without it skip
+# the pattern entirely. Matches never span lines, so Hyperscan, which only
+# reports where a match ends, places them on the same line as re does.
+SECURITY_PATTERNS = [
+    (r"os\.environ\[['\"]\w+['\"]\]", "os.environ", "Direct environment variable access", Severity.HIGH, True),
+    (r"eval[^\S\n]*\(", "eval", "Unsafe eval() usage", Severity.CRITICAL, False),
+    (r"exec[^\S\n]*\(", "exec", "Unsafe exec() usage", Severity.CRITICAL, False),
+    (r"pickle\.load", "pickle.load", "pickle.load may be unsafe", Severity.MEDIUM, True),
+    (r"yaml\.load", "yaml.load", "yaml.load without SafeLoader", Severity.HIGH, True),
+    (r"password[^\S\n]*=", "password", "Password in code", Severity.HIGH, False),
+    (r"secret[^\S\n]*=", "secret", "Secret key in code", Severity.HIGH, False),
+    (r"api[_-]?key[^\S\n]*=", "api", "API key in code", Severity.HIGH, False),
+]
+
+# Indexes into SECURITY_PATTERNS, used by the AST checks
+(SEC_ENVIRON, SEC_EVAL, SEC_EXEC, SEC_PICKLE, SEC_YAML,
+ SEC_PASSWORD, SEC_SECRET, SEC_API_KEY) = range(len(SECURITY_PATTERNS))
+
+# Line-level smells: a print(...) call on one line, and a bare `_name` line
+_PRINT_CALL_TAIL = r"[^\S\n]*\([^)\n]*\)"
+_UNUSED_PATTERN = r"^[^\S\n]*_+\w*[^\S\n]*$"
+
+# Regex fallback for sources that do not parse: all Python checks fused
+# into one alternation, scanned once per file.
+# Group name -> (regex, literal every match contains). Group gN maps to
+# SECURITY_PATTERNS[N]; the print tail is a lookahead so a call nested
+# inside print(...) is still matched.
+_PY_GROUPS = {
+    'print': (f"print(?={_PRINT_CALL_TAIL})", "print"),
+    'unused': (_UNUSED_PATTERN, "_"),
+    **{f"g{i}": (p, literal) for i, (p, literal, *_) in enumerate(SECURITY_PATTERNS)},
+}
+
+# Line breaks, for building offset-to-line indexes
+_NEWLINE_RE = re.compile('\n')
+_NEWLINE_BYTES_RE = re.compile(b'\n')
+
+
+def _js_token(kind: str):
+    """Scanner action recording a check kind at the match offset"""
+    return lambda scanner, token: (kind, scanner.match.start())
+
+
+# JavaScript checks as one re.Scanner: the token patterns and skip rules
+# (runs of text up to the next character that could start a token, else a
+# single character) are fused into a single regex, so each file is
+# tokenized in one pass. Unlike re.compile, re.Scanner does not default to
+# Unicode matching, so \w, \b and \s need the flag passed explicitly.
+_JS_SCANNER = re.Scanner([
+    (r"(?<=[^=!\n])==(?=[^=\n])", _js_token('eq')),
+    (r"\bvar(?=[^\S\n]+\w)", _js_token('var')),
+    (r"console\.(?:log|debug|info)", _js_token('console')),
+    (r"[^=vc]+(?:[=vc](?!=|ar\b|onsole\.)[^=vc]*)*", None),
+    (r"[\s\S]", None),
+], flags=re.UNICODE)
+
+
+# Bump whenever checks change so stale cache entries are not reused
+ANALYZER_VERSION = "9"
+
+# Per-file results cache, created under the project root
+CACHE_DIR_NAME = ".auto-guardian-cache"
+CACHE_MAX_BYTES = 50 * 1024 * 1024
+
+# Below this many files, scanning serially beats process pool start-up
+PARALLEL_MIN_FILES = 8
+
+# Config files that change linter results
+LINT_CONFIG_FILES = ('pyproject.toml', 'ruff.toml', '.ruff.toml', 'setup.cfg', 'tox.ini', '.flake8')
+
+# Python sources Ruff lints, all covered by its cache key
+LINT_PY_EXTS = ('.py', '.pyi', '.ipynb')
+
+# Files passed per linter invocation, keeping argv well under ARG_MAX
+LINT_BATCH_SIZE = 200
+
+# Files larger than this are memory-mapped and decoded straight from the
+# mapping; if they do not parse, the fallback scan reads the mapping itself
+# (with Hyperscan when it is installed)
+MMAP_THRESHOLD = 1_000_000
+
+# Directories never worth descending into, checked before any .gitignore
+_SKIP_DIRS = {
+    '.git', 'node_modules', '__pycache__', '.venv', 'venv', 'dist', 'build', CACHE_DIR_NAME
+}
+
+
+def _load_ignore_spec(root: Path):
+    """Compile root's .gitignore into one matcher, if pathspec is installed"""
+    gitignore = root / '.gitignore'
+    if pathspec is None or not gitignore.is_file():
+        return None
+    with open(gitignore, 'r', encoding='utf-8', errors='replace') as f:
+        return pathspec.GitIgnoreSpec.from_lines(f)
+
+
+def _walk(root, exts: tuple[str, ...], spec=None, prefix: str = ''):
+    """Yield paths of files under root ending in one of exts
+
+    Paths are rendered as Path(root) / relative path would be, so a root
+    of '.' yields bare relative paths. spec, if given, is matched against
+    the relative path. Unreadable directories are skipped.
+    """
+    root = str(Path(root))
+    base = '' if root == '.' else os.path.join(root, '')
+    try:
+        entries = os.scandir(base + prefix or '.')
+    except OSError:
+        return
+    with entries:
+        for entry in entries:
+            rel = prefix + entry.name
+            if entry.is_dir(follow_symlinks=False):
+                if entry.name in _SKIP_DIRS or (spec and spec.match_file(rel + '/')):
+                    continue
+                yield from _walk(root, exts, spec, rel + '/')
+            elif entry.is_file() and entry.name.endswith(exts):
+                if not (spec and spec.match_file(rel)):
+                    yield base + rel
+
+
+class PythonVisitor(ast.NodeVisitor):
+    """Collect print/unused/security findings in a single AST walk"""
+    
+    # Assignment target suffixes mapped to SECURITY_PATTERNS indexes,
+    # mirroring the case-sensitive `password\s*=`-style regexes
+    SECRET_NAMES = (
+        ("password", SEC_PASSWORD), ("secret", SEC_SECRET),
+        ("api_key", SEC_API_KEY), ("apikey", SEC_API_KEY),
+    )
+    
+    def __init__(self):
+        self.smells: list[tuple[str, int, int]] = []
+        self.security_hits: dict[int, int] = {}
+    
+    def _hit(self, index: int, node: ast.AST):
+        """Record a security finding, keeping the earliest line"""
+        line = self.security_hits.get(index)
+        if line is None or node.lineno < line:
+            self.security_hits[index] = node.lineno
+    
+    def _check_name(self, name: Optional[str], node: ast.AST):
+        """Flag credential-looking names being assigned"""
+        if not name:
+            return
+        for suffix, index in self.SECRET_NAMES:
+            if name.endswith(suffix):
+                self._hit(index, node)
+    
+    def _check_targets(self, targets: list[ast.expr]):
+        """Check every name bound by assignment targets"""
+        for target in targets:
+            for node in ast.walk(target):
+                if isinstance(node, ast.Name):
+                    self._check_name(node.id, node)
+                elif isinstance(node, ast.Attribute):
+                    self._check_name(node.attr, node)
+    
+    def visit_Expr(self, node: ast.Expr):
+        # A bare `_name` statement does nothing
+        if isinstance(node.value, ast.Name) and node.value.id.startswith('_'):
+            self.smells.append(('unused', node.lineno, 0))
+        self.generic_visit(node)
+    
+    def visit_Call(self, node: ast.Call):
+        func = node.func
+        if isinstance(func, ast.Name):
+            if func.id == 'print':
+                self.smells.append(('print', node.lineno, node.col_offset))
+            elif func.id == 'eval':
+                self._hit(SEC_EVAL, node)
+            elif func.id == 'exec':
+                self._hit(SEC_EXEC, node)
+        elif isinstance(func, ast.Attribute) and isinstance(func.value, ast.Name):
+            if func.value.id == 'pickle' and func.attr.startswith('load'):
+                self._hit(SEC_PICKLE, node)
+            elif func.value.id == 'yaml' and func.attr.startswith('load') \
+                    and not self._has_safe_loader(node):
+                self._hit(SEC_YAML, node)
+        
+        for keyword in node.keywords:
+            self._check_name(keyword.arg, keyword.value)
+        self.generic_visit(node)
+    
+    def visit_Assign(self, node: ast.Assign):
+        self._check_targets(node.targets)
+        self.generic_visit(node)
+    
+    def visit_AnnAssign(self, node: ast.AnnAssign):
+        self._check_targets([node.target])
+        self.generic_visit(node)
+    
+    def visit_AugAssign(self, node: ast.AugAssign):
+        self._check_targets([node.target])
+        self.generic_visit(node)
+    
+    def visit_arguments(self, node: ast.arguments):
+        # Parameter defaults, e.g. def connect(password="...")
+        positional = node.posonlyargs + node.args
+        for arg, default in zip(positional[len(positional) - len(node.defaults):], node.defaults):
+            self._check_name(arg.arg, default)
+        for arg, default in zip(node.kwonlyargs, node.kw_defaults):
+            if default is not None:
+                self._check_name(arg.arg, default)
+        self.generic_visit(node)
+    
+    def visit_Subscript(self, node: ast.Subscript):
+        # os.environ['NAME']
+        value = node.value
+        if isinstance(value, ast.Attribute) and value.attr == 'environ' \
+                and isinstance(value.value, ast.Name) and value.value.id == 'os' \
+                and isinstance(node.slice, ast.Constant) and isinstance(node.slice.value, str):
+            self._hit(SEC_ENVIRON, node)
+        self.generic_visit(node)
+    
+    @staticmethod
+    def _has_safe_loader(node: ast.Call) -> bool:
+        """Whether a yaml.load call passes a SafeLoader, by keyword or position"""
+        loader = node.args[1] if len(node.args) > 1 else None
+        for keyword in node.keywords:
+            if keyword.arg == 'Loader':
+                loader = keyword.value
+        if loader is None:
+            return False
+        name = loader.attr if isinstance(loader, ast.Attribute) else getattr(loader, 'id', '')
+        return name.endswith('SafeLoader')
+
+
+def _line_starts(content) -> array:
+    """Offsets at which each line of a str or bytes-like buffer starts"""
+    newline = _NEWLINE_RE if isinstance(content, str) else _NEWLINE_BYTES_RE
+    line_starts = array('q', [0])
+    line_starts.extend(m.end() for m in newline.finditer(content))
+    return line_starts
+
+
+def _position(line_starts: array, offset: int) -> tuple[int, int]:
+    """1-based line and 0-based column of an offset, given its line starts"""
+    line = bisect_right(line_starts, offset)
+    return line, offset - line_starts[line - 1]
+
+
+@lru_cache(maxsize=None)
+def _py_regex(names: tuple[str, ...], binary: bool) -> re.Pattern:
+    """Fused regex over the named _PY_GROUPS, compiled once per combination"""
+    pattern = "|".join(f"(?P<{name}>{_PY_GROUPS[name][0]})" for name in names)
+    return re.compile(pattern.encode() if binary else pattern, re.MULTILINE)
+
+
+def _regex_findings(content) -> tuple[list[tuple[str, int, int]], dict[int, int]]:
+    """Find print/unused/security matches with the fused regex
+
+    content may be a str or any bytes-like buffer, matched by the str or
+    bytes flavour of the regex respectively.
+    """
+    binary = not isinstance(content, str)
+    # Groups whose literal is absent cannot match, so they are dropped from
+    # the alternation; find() works on mmaps, where `in` tests single bytes
+    names = tuple(
+        name for name, (_, literal) in _PY_GROUPS.items()
+        if content.find(literal.encode() if binary else literal) != -1
+    )
+    if not names:
+        return [], {}
+    
+    smells = []
+    security_hits = {}
+    line_starts = None
+    
+    # One pass over the file for print/unused/security checks
+    for m in _py_regex(names, binary).finditer(content):
+        kind = m.lastgroup
+        # Most files match nothing, so the line index is built on demand
+        if line_starts is None:
+            line_starts = _line_starts(content)
+        line_num, column = _position(line_starts, m.start())
+        
+        if kind == 'print':
+            smells.append((kind, line_num, column))
+        elif kind == 'unused':
+            smells.append((kind, line_num, 0))
+        else:
+            # Security patterns are reported at their first occurrence
+            security_hits.setdefault(int(kind[1:]), line_num)
+    
+    return smells, security_hits
+
+
+def _check_python(path: str, raw: bytes) -> list[CodeIssue]:
+    """Run Python checks over a file's content"""
+    content = raw.decode('utf-8', 'replace')
+    tree, syntax_error = _parse_python(path, content)
+    
+    if tree is not None:
+        smells, security_hits = _visit_python(tree)
+    else:
+        # Unparseable source: fall back to the regex scan
+        smells, security_hits = _regex_findings(content)
+    
+    return _python_issues(path, smells, security_hits, syntax_error)
+
+
+def _check_python_mapped(path: str, mm: mmap.mmap) -> list[CodeIssue]:
+    """Run Python checks over a memory-mapped large file
+
+    The source is decoded straight from the mapping, with no intermediate
+    bytes copy, and checked like any other file. Sources that do not parse
+    fall back to scanning the raw mapping, with Hyperscan when installed.
+    """
+    tree, syntax_error = _parse_python(path, str(mm, 'utf-8', 'replace'))
+    
+    if tree is not None:
+        smells, security_hits = _visit_python(tree)
+    elif hyperscan is not None:
+        smells, security_hits = _hyperscan_findings(mm)
+    else:
+        smells, security_hits = _regex_findings(mm)
+    return _python_issues(path, smells, security_hits, syntax_error)
+
+
+def _parse_python(path: str, content: str) -> tuple[Optional[ast.AST], Optional[CodeIssue]]:
+    """Parse source, returning its AST or the issue for its syntax error"""
+    try:
+        return ast.parse(content), None
+    except SyntaxError as e:
+        return None, _syntax_error(path, e)
+
+
+def _visit_python(tree: ast.AST) -> tuple[list[tuple[str, int, int]], dict[int, int]]:
+    """Collect findings from a parsed source in one PythonVisitor walk"""
+    visitor = PythonVisitor()
+    visitor.visit(tree)
+    return visitor.smells, visitor.security_hits
+
+
+def _syntax_error(path: str, e: SyntaxError) -> CodeIssue:
+    """Build the issue reported for a file that does not parse"""
+    return CodeIssue(
+        file=path,
+        line=e.lineno or 1,
+        column=e.offset or 0,
+        severity=Severity.CRITICAL,
+        issue_type=IssueType.SYNTAX_ERROR,
+        message=f"Syntax error: {e.msg}",
+        suggestion="Review syntax on this line",
+        fixable=False
+    )
+
+
+@lru_cache(maxsize=None)
+def _hyperscan_db():
+    """Compile the Python checks into a Hyperscan database, once per process
+
+    Expression ids: 0 is print, 1 is unused, 2 + N is SECURITY_PATTERNS[N].
+    """
+    expressions = [f"print{_PRINT_CALL_TAIL}", _UNUSED_PATTERN] + [p for p, *_ in SECURITY_PATTERNS]
+    flags = [
+        hyperscan.HS_FLAG_SOM_LEFTMOST,
+        hyperscan.HS_FLAG_SOM_LEFTMOST | hyperscan.HS_FLAG_MULTILINE,
+    ]
+    # Only the first occurrence of a security pattern is reported
+    flags += [hyperscan.HS_FLAG_SINGLEMATCH] * len(SECURITY_PATTERNS)
+    
+    db = hyperscan.Database()
+    db.compile(
+        expressions=[e.encode() for e in expressions],
+        ids=list(range(len(expressions))),
+        elements=len(expressions),
+        flags=flags,
+    )
+    return db
+
+
+def _hyperscan_findings(data) -> tuple[list[tuple[str, int, int]], dict[int, int]]:
+    """Find print/unused/security matches in bytes-like data with Hyperscan"""
+    events = []
+    
+    def on_match(expression_id, start, end, flags, context):
+        # Security matches carry no start offset, so they are placed by their
+        # end; the patterns never span lines, so this is the same line
+        events.append((start if expression_id < 2 else end, expression_id))
+    
+    _hyperscan_db().scan(data, match_event_handler=on_match)
+    
+    smells = []
+    security_hits = {}
+    line_starts = _line_starts(data) if events else None
+    for offset, expression_id in events:
+        line_num, column = _position(line_starts, offset)
+        if expression_id == 0:
+            smells.append(('print', line_num, column))
+        elif expression_id == 1:
+            smells.append(('unused', line_num, 0))
+        else:
+            security_hits.setdefault(expression_id - 2, line_num)
+    
+    return smells, security_hits
+
+
+def _python_issues(path: str, smells: list[tuple[str, int, int]], security_hits: dict[int, int],
+                   syntax_error: Optional[CodeIssue] = None) -> list[CodeIssue]:
+    """Build issues from Python findings"""
+    issues = []
+    print_line = 0
+    for kind, line_num, column in sorted(smells, key=lambda smell: smell[1]):
+        if kind == 'print':
+            # Report print() once per line
+            if line_num == print_line:
+                continue
+            print_line = line_num
+            issues.append(CodeIssue(
+                file=path,
+                line=line_num,
+                column=column,
+                severity=Severity.LOW,
+                issue_type=IssueType.CODE_SMELL,
+                message="print() usage for debugging",
+                suggestion="Use logger instead of print",
+                fixable=True
+            ))
+        else:
+            issues.append(CodeIssue(
+                file=path,
+                line=line_num,
+                column=0,
+                severity=Severity.INFO,
+                issue_type=IssueType.UNUSED_CODE,
+                message="Unused variable",
+                fixable=True
+            ))
+    
+    if syntax_error is not None:
+        issues.append(syntax_error)
+    
+    # Check security vulnerabilities
+    for index in sorted(security_hits):
+        _, _, desc, severity, fixable = SECURITY_PATTERNS[index]
+        issues.append(CodeIssue(
+            file=path,
+            line=security_hits[index],
+            column=0,
+            severity=severity,
+            issue_type=IssueType.SECURITY_VULNERABILITY,
+            message=f"Security: {desc}",
+            suggestion="Move to .env file",
+            fixable=fixable
+        ))
+    
+    return issues
+
+
+def _check_javascript(path: str, raw: bytes) -> list[CodeIssue]:
+    """Run JavaScript/TypeScript checks over a file's content"""
+    content = raw.decode('utf-8', 'replace')
+    issues = []
+    seen = set()
+
+    findings, _ = _JS_SCANNER.scan(content)
+    line_starts = _line_starts(content) if findings else None
+
+    for kind, start in findings:
+        line_num, column = _position(line_starts, start)
+
+        # Each check is reported once per line
+        if (kind, line_num) in seen:
+            continue
+        seen.add((kind, line_num))
+
+        # Check == instead of ===
+        if kind == 'eq':
+            issues.append(CodeIssue(
+                file=path,
+                line=line_num,
+                column=column,
+                severity=Severity.MEDIUM,
+                issue_type=IssueType.CODE_SMELL,
+                message="Use === instead of ==",
+                suggestion="Use === for strict comparison",
+                fixable=True
+            ))
+
+        # Check var instead of let/const
+        elif kind == 'var':
+            issues.append(CodeIssue(
+                file=path,
+                line=line_num,
+                column=column,
+                severity=Severity.LOW,
+                issue_type=IssueType.DEPRECATED_USAGE,
+                message="Use let/const instead of var",
+                suggestion="Use let or const",
+                fixable=True
+            ))
+
+        # Check console.log
+        else:
+            issues.append(CodeIssue(
+                file=path,
+                line=line_num,
+                column=column,
+                severity=Severity.INFO,
+                issue_type=IssueType.CODE_SMELL,
+                message="Remaining console.log statement",
+                suggestion="Remove or use logger",
+                fixable=True
+            ))
+
+    return issues
+
+
+def _cache_key(check, content_digest: bytes) -> str:
+    """Cache key for a file's content digest under a given check
+
+    Results also depend on the interpreter's grammar, and for mapped files
+    on whether the Hyperscan fallback is in use, so both salt the key.
+    """
+    salt = f"{ANALYZER_VERSION}:{check.__name__}:{sys.version_info[0]}.{sys.version_info[1]}"
+    if check is _check_python_mapped:
+        salt += f":hyperscan={hyperscan is not None}"
+    digest = hashlib.sha256(f"{salt}:".encode())
+    digest.update(content_digest)
+    return digest.hexdigest()
+
+
+def _file_digest(path: str) -> bytes:
+    """SHA-256 of a file's content, or empty if it cannot be read"""
+    try:
+        with open(path, 'rb') as f:
+            return hashlib.sha256(f.read()).digest()
+    except OSError:
+        return b''
+
+
+def _cache_load(cache_dir: str, key: str) -> Optional[list[dict]]:
+    """Load cached issues for key, if present"""
+    entry = os.path.join(cache_dir, f"{key}.json")
+    try:
+        with open(entry, 'rb') as f:
+            issues = _load_json(f.read())
+        # Refresh mtime so pruning evicts least recently used entries first
+        os.utime(entry)
+    except (OSError, ValueError):
+        return None
+    return issues
+
+
+def _cache_store(cache_dir: str, key: str, issues: list[dict]):
+    """Store issues for key, written atomically"""
+    entry = os.path.join(cache_dir, f"{key}.json")
+    tmp = f"{entry}.{os.getpid()}.tmp"
+    try:
+        with open(tmp, 'wb') as f:
+            f.write(_dump_json(issues))
+        os.replace(tmp, entry)
+    except OSError as e:
+        print(f"Cache write failed for {entry}: {e}")
+
+
+def _prune_cache(cache_dir: str, max_bytes: int):
+    """Delete least recently used cache entries until under max_bytes"""
+    entries = []
+    total = 0
+    with os.scandir(cache_dir) as it:
+        for entry in it:
+            if entry.is_file() and entry.name.endswith('.json'):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+                total += stat.st_size
+    
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            continue
+        total -= size
+
+
+def _cached_check(path: str, check, raw, cache_dir: Optional[str]) -> tuple[Optional[bytes], list[dict]]:
+    """Run check over raw file content, reusing cached results for unchanged content
+
+    Returns the content digest (None when caching is off) and the issues.
+    """
+    content_digest = None
+    if cache_dir:
+        content_digest = hashlib.sha256(raw).digest()
+        key = _cache_key(check, content_digest)
+        cached = _cache_load(cache_dir, key)
+        if cached is not None:
+            return content_digest, [dict(item, file=path) for item in cached]
+    
+    issues = [issue.to_dict() for issue in check(path, raw)]
+    
+    if cache_dir:
+        # Entries are keyed by content alone, so the path is filled in on load
+        _cache_store(cache_dir, key, [
+            {k: v for k, v in item.items() if k != 'file'} for item in issues
+        ])
+    return content_digest, issues
+
+
+def _scan_one(path: str, check, cache_dir: Optional[str] = None) -> tuple[Optional[bytes], list[dict]]:
+    """Scan a single file with check, returning its content digest and issues"""
+    try:
+        with open(path, 'rb') as f:
+            mapped_check = _MAPPED_CHECKS.get(check)
+            if mapped_check and os.fstat(f.fileno()).st_size > MMAP_THRESHOLD:
+                # Let the OS page large files in on demand instead of copying them
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    return _cached_check(path, mapped_check, mm, cache_dir)
+            raw = f.read()
+        
+        return _cached_check(path, check, raw, cache_dir)
+    except Exception as e:
+        print(f"Error reading {path}: {e}")
+        return None, []
+
+
+# Checks with a memory-mapped variant for files over MMAP_THRESHOLD
+_MAPPED_CHECKS = {_check_python: _check_python_mapped}
+
+
 class CodeAnalyzer:
     """Main code analyzer"""
     
-    def __init__(self, project_root: str = None):
+    def __init__(self, project_root: str = None, use_cache: bool = True,
+                 base_ref: Optional[str] = None):
         self.project_root = Path(project_root) if project_root else Path.cwd()
+        self.cache_dir = self.project_root / CACHE_DIR_NAME if use_cache else None
+        self.base_ref = base_ref
+        self.ignore_spec = _load_ignore_spec(self.project_root)
+        # Content digests of scanned files, reused by the lint cache key
+        self.file_digests: dict[str, bytes] = {}
         self.issues: list[CodeIssue] = []
         self.result = ScanResult()
     
     def scan_python(self) -> list[CodeIssue]:
         """Scan Python files"""
-        issues = []
-        
         # Find Python files
-        py_files = list(self.project_root.rglob("*.py"))
+        py_files = list(_walk(self.project_root, (".py",), self.ignore_spec))
         self.result.files_scanned += len(py_files)
         
-        for py_file in py_files:
-            try:
-                content = py_file.read_text(encoding='utf-8')
-                lines = content.split('\n')
-                
-                for line_num, line in enumerate(lines, 1):
-                    # Check common formatting errors
-                    if re.search(r'print\s*\([^)]*\)', line):
-                        issues.append(CodeIssue(
-                            file=str(py_file),
-                            line=line_num,
-                            column=line.find('print'),
-                            severity=Severity.LOW,
-                            issue_type=IssueType.CODE_SMELL,
-                            message="print() usage for debugging",
-                            suggestion="Use logger instead of print",
-                            fixable=True
-                        ))
-                    
-                    # Check unused variables
-                    if re.match(r'^\s*_+\w*$', line.strip()):
-                        issues.append(CodeIssue(
-                            file=str(py_file),
-                            line=line_num,
-                            column=0,
-                            severity=Severity.INFO,
-                            issue_type=IssueType.UNUSED_CODE,
-                            message="Unused variable",
-                            fixable=True
-                        ))
-                
-                # Check syntax errors
-                try:
-                    import ast
-                    ast.parse(content)
-                except SyntaxError as e:
-                    issues.append(CodeIssue(
-                        file=str(py_file),
-                        line=e.lineno or 1,
-                        column=e.offset or 0,
-                        severity=Severity.CRITICAL,
-                        issue_type=IssueType.SYNTAX_ERROR,
-                        message=f"Syntax error: {e.msg}",
-                        suggestion="Review syntax on this line",
-                        fixable=False
-                    ))
-                
-                # Check security vulnerabilities
-                security_patterns = [
-                    (r"os\.environ\[['\"]\w+['\"]\]", "Direct environment variable access", Severity.HIGH, True),
-                    (r"eval\s*\(", "Unsafe eval() usage", Severity.CRITICAL, False),
-                    (r"exec\s*\(", "Unsafe exec() usage", Severity.CRITICAL, False),
-                    (r"pickle\.load", "pickle.load may be unsafe", Severity.MEDIUM, True),
-                    (r"yaml\.load", "yaml.load without SafeLoader", Severity.HIGH, True),
-                    (r"password\s*=", "Password in code", Severity.HIGH, False),
-                    (r"secret\s*=", "Secret key in code", Severity.HIGH, False),
-                    (r"api[_-]?key\s*=", "API key in code", Severity.HIGH, False),
-                ]
-                
-                for pattern, desc, severity, fixable in security_patterns:
-                    if re.search(pattern, content):
-                        line_num = self._find_line_with_pattern(lines, pattern)
-                        issues.append(CodeIssue(
-                            file=str(py_file),
-                            line=line_num,
-                            column=0,
-                            severity=severity,
-                            issue_type=IssueType.SECURITY_VULNERABILITY,
-                            message=f"Security: {desc}",
-                            suggestion="Move to .env file",
-                            fixable=fixable
-                        ))
-                
-            except Exception as e:
-                print(f"Error reading {py_file}: {e}")
-        
-        return issues
+        return self._scan_files(_check_python, py_files)
     
     def scan_javascript(self) -> list[CodeIssue]:
         """Scan JavaScript files"""
-        issues = []
-        js_files = list(self.project_root.rglob("*.js")) + list(self.project_root.rglob("*.ts"))
+        js_files = list(_walk(self.project_root, (".js", ".ts"), self.ignore_spec))
         
-        for js_file in js_files:
-            try:
-                content = js_file.read_text(encoding='utf-8')
-                lines = content.split('\n')
-                
-                # Check == instead of ===
-                for line_num, line in enumerate(lines, 1):
-                    if re.search(r'[^=!]==[^=]', line):
-                        issues.append(CodeIssue(
-                            file=str(js_file),
-                            line=line_num,
-                            column=line.find('=='),
-                            severity=Severity.MEDIUM,
-                            issue_type=IssueType.CODE_SMELL,
-                            message="Use === instead of ==",
-                            suggestion="Use === for strict comparison",
-                            fixable=True
-                        ))
-                    
-                    # Check var instead of let/const
-                    if re.search(r'\bvar\s+\w+', line):
-                        issues.append(CodeIssue(
-                            file=str(js_file),
-                            line=line_num,
-                            column=line.find('var'),
-                            severity=Severity.LOW,
-                            issue_type=IssueType.DEPRECATED_USAGE,
-                            message="Use let/const instead of var",
-                            suggestion="Use let or const",
-                            fixable=True
-                        ))
-                    
-                    # Check console.log
-                    if re.search(r'console\.(log|debug|info)', line):
-                        issues.append(CodeIssue(
-                            file=str(js_file),
-                            line=line_num,
-                            column=line.find('console'),
-                            severity=Severity.INFO,
-                            issue_type=IssueType.CODE_SMELL,
-                            message="Remaining console.log statement",
-                            suggestion="Remove or use logger",
-                            fixable=True
-                        ))
-                
-            except Exception as e:
-                print(f"Error reading {js_file}: {e}")
+        return self._scan_files(_check_javascript, js_files)
+    
+    def _scan_files(self, check, paths: list[str]) -> list[CodeIssue]:
+        """Run a per-file check over paths, in worker processes for larger trees"""
+        scan_one = partial(_scan_one, check=check, cache_dir=self._ensure_cache_dir())
+        
+        if len(paths) < PARALLEL_MIN_FILES:
+            results = [scan_one(path) for path in paths]
+        else:
+            with ProcessPoolExecutor() as executor:
+                results = list(executor.map(scan_one, paths, chunksize=32))
         
+        issues = []
+        for path, (content_digest, file_issues) in zip(paths, results):
+            if content_digest is not None:
+                self.file_digests[path] = content_digest
+            issues.extend(CodeIssue.from_dict(item) for item in file_issues)
         return issues
     
-    def _find_line_with_pattern(self, lines: list[str], pattern: str) -> int:
-        """Find line containing pattern"""
-        for line_num, line in enumerate(lines, 1):
-            if re.search(pattern, line):
-                return line_num
-        return 1
+    def _ensure_cache_dir(self) -> Optional[str]:
+        """Create the cache directory if needed, turning caching off if it cannot be"""
+        if self.cache_dir is None:
+            return None
+        try:
+            self.cache_dir.mkdir(exist_ok=True)
+        except OSError as e:
+            print(f"Cache disabled, could not create {self.cache_dir}: {e}")
+            self.cache_dir = None
+            return None
+        return str(self.cache_dir)
     
     def run_linters(self) -> list[CodeIssue]:
         """Run external linting tools"""
         issues = []
+        changed = self._changed_files()
         
-        # Run Flake8 for Python
-        try:
-            result = subprocess.run(
-                ['flake8', '.', '--format=json', '--max-line-length=100'],
-                capture_output=True,
-                text=True,
-                cwd=self.project_root
-            )
-            if result.returncode != 0:
-                data = json.loads(result.stdout) if result.stdout else []
-                for item in data:
-                    issues.append(CodeIssue(
-                        file=item['filename'],
-                        line=item['line_number'],
-                        column=item['column_number'],
-                        severity=self._map_flake8_severity(item['type']),
-                        issue_type=IssueType.LINTING_ERROR,
-                        message=item['text'],
-                        rule_id=item['id'],
-                        fixable=True
-                    ))
-        except Exception as e:
-            print(f"Flake8 not available: {e}")
+        # Run Ruff for Python, falling back to Flake8 when it is not installed
+        py_targets = self._lint_targets(changed, (".py",))
+        ruff_issues = self._run_ruff(py_targets)
+        if ruff_issues is not None:
+            issues.extend(ruff_issues)
+        else:
+            issues.extend(self._run_flake8(py_targets))
         
         # Run ESLint if available
+        issues.extend(self._run_eslint(self._lint_targets(changed, (".js", ".ts"))))
+        
+        return issues
+    
+    def _changed_files(self) -> Optional[list[str]]:
+        """Files changed since the merge base with base_ref, or None to lint the whole project"""
+        if not self.base_ref:
+            return None
         try:
-            result = subprocess.run(
-                ['npx', 'eslint', '.', '--format=json'],
-                capture_output=True,
-                text=True,
+            # base...HEAD diffs against the merge base, so upstream-only changes are left out
+            output = subprocess.check_output(
+                ['git', 'diff', '--name-only', '--relative', f"{self.base_ref}...HEAD"],
                 cwd=self.project_root,
-                timeout=60
+                stderr=subprocess.DEVNULL,
+                text=True
             )
-            if result.returncode != 0:
-                data = json.loads(result.stdout) if result.stdout else []
-                for item in data:
-                    for msg in item.get('messages', []):
+        except (OSError, subprocess.CalledProcessError) as e:
+            print(f"Could not list changed files, linting everything: {e}")
+            return None
+        return output.splitlines()
+    
+    def _lint_targets(self, changed: Optional[list[str]], exts: tuple[str, ...]) -> list[list[str]]:
+        """Batches of linter arguments, sized to stay under ARG_MAX"""
+        if changed is None:
+            return [['.']]
+        
+        files = [
+            path for path in changed
+            if path.endswith(exts)
+            and not _SKIP_DIRS.intersection(Path(path).parts)
+            # Deleted files still show up in the diff
+            and (self.project_root / path).is_file()
+        ]
+        return [files[i:i + LINT_BATCH_SIZE] for i in range(0, len(files), LINT_BATCH_SIZE)]
+    
+    def _run_ruff(self, targets: list[list[str]]) -> Optional[list[CodeIssue]]:
+        """Run Ruff over targets, or return None if it is unavailable"""
+        if not targets:
+            return []
+        
+        try:
+            version = subprocess.run(['ruff', '--version'], capture_output=True, text=True).stdout
+        except FileNotFoundError:
+            return None
+        
+        cache_dir = self._ensure_cache_dir()
+        if cache_dir:
+            cache_key = self._lint_cache_key('ruff', version.strip(), targets)
+            cached = _cache_load(cache_dir, cache_key)
+            if cached is not None:
+                return [CodeIssue.from_dict(item) for item in cached]
+        
+        data = []
+        try:
+            for batch in targets:
+                result = subprocess.run(
+                    ['ruff', 'check', '--output-format=json', '--exit-zero', '--line-length=100',
+                     '--force-exclude', *batch],
+                    capture_output=True,
+                    text=True,
+                    cwd=self.project_root
+                )
+                # With --exit-zero, a non-zero status means Ruff itself failed
+                if result.returncode != 0:
+                    print(f"Ruff failed: {result.stderr.strip()}")
+                    return None
+                data.extend(json.loads(result.stdout) if result.stdout else [])
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"Ruff failed: {e}")
+            return None
+        
+        issues = []
+        for item in data:
+            code = item.get('code')
+            # Ruff reports syntax errors without a rule code, or as 'invalid-syntax'
+            if not code or code == 'invalid-syntax':
+                code = 'E999'
+            issues.append(CodeIssue(
+                file=sys.intern(item['filename']),
+                line=item['location']['row'],
+                column=item['location']['column'],
+                severity=self._map_flake8_severity(code),
+                issue_type=IssueType.LINTING_ERROR,
+                message=item['message'],
+                rule_id=sys.intern(code),
+                fixable=item.get('fix') is not None
+            ))
+        
+        if cache_dir:
+            _cache_store(cache_dir, cache_key, [issue.to_dict() for issue in issues])
+        return issues
+    
+    def _lint_cache_key(self, tool: str, version: str, targets: list[list[str]]) -> str:
+        """Cache key covering the tool version, linted sources and linter config
+
+        Digests of files already read by the scan are reused, so only sources
+        the scan skips (stubs, notebooks) and config files are read here.
+        """
+        digest = hashlib.sha256(
+            f"{ANALYZER_VERSION}:{tool}:{version}:{self.project_root.resolve()}".encode()
+        )
+        digest.update(json.dumps(targets).encode())
+        if targets == [['.']]:
+            paths = sorted(_walk(self.project_root, LINT_PY_EXTS, self.ignore_spec))
+        else:
+            paths = sorted(str(self.project_root / path) for batch in targets for path in batch)
+        paths += [str(self.project_root / name) for name in LINT_CONFIG_FILES
+                  if (self.project_root / name).is_file()]
+        for path in paths:
+            digest.update(path.encode())
+            digest.update(self.file_digests.get(path) or _file_digest(path))
+        return f"lint-{tool}-{digest.hexdigest()}"
+    
+    def _run_flake8(self, targets: list[list[str]]) -> list[CodeIssue]:
+        """Run Flake8 over targets"""
+        issues = []
+        
+        try:
+            for batch in targets:
+                result = subprocess.run(
+                    ['flake8', '--format=json', '--max-line-length=100', *batch],
+                    capture_output=True,
+                    text=True,
+                    cwd=self.project_root
+                )
+                if result.returncode != 0:
+                    data = json.loads(result.stdout) if result.stdout else []
+                    for item in data:
                         issues.append(CodeIssue(
-                            file=item['filePath'],
-                            line=msg['line'],
-                            column=msg['column'],
-                            severity=self._map_eslint_severity(msg['severity']),
+                            file=sys.intern(item['filename']),
+                            line=item['line_number'],
+                            column=item['column_number'],
+                            severity=self._map_flake8_severity(item['type']),
                             issue_type=IssueType.LINTING_ERROR,
-                            message=msg['message'],
-                            rule_id=msg['ruleId'],
-                            fixable=msg.get('fix') is not None
+                            message=item['text'],
+                            rule_id=sys.intern(item['id']),
+                            fixable=True
                         ))
+        except Exception as e:
+            print(f"Flake8 not available: {e}")
+        
+        return issues
+    
+    def _run_eslint(self, targets: list[list[str]]) -> list[CodeIssue]:
+        """Run ESLint over targets"""
+        issues = []
+        
+        try:
+            for batch in targets:
+                result = subprocess.run(
+                    ['npx', 'eslint', '--format=json', *batch],
+                    capture_output=True,
+                    text=True,
+                    cwd=self.project_root,
+                    timeout=60
+                )
+                if result.returncode != 0:
+                    data = json.loads(result.stdout) if result.stdout else []
+                    for item in data:
+                        for msg in item.get('messages', []):
+                            issues.append(CodeIssue(
+                                file=sys.intern(item['filePath']),
+                                line=msg['line'],
+                                column=msg['column'],
+                                severity=self._map_eslint_severity(msg['severity']),
+                                issue_type=IssueType.LINTING_ERROR,
+                                message=msg['message'],
+                                rule_id=msg['ruleId'] and sys.intern(msg['ruleId']),
+                                fixable=msg.get('fix') is not None
+                            ))
         except Exception as e:
             print(f"ESLint not available: {e}")
         
@@ -339,28 +1065,17 @@ class CodeAnalyzer:
         linter_issues = self.run_linters()
         
         self.issues = python_issues + js_issues + linter_issues
+        
+        if self.cache_dir and self.cache_dir.is_dir():
+            _prune_cache(str(self.cache_dir), CACHE_MAX_BYTES)
         self.result.issues = self.issues
         self.result.issues_found = len(self.issues)
         
         # Categorize issues
-        for issue in self.issues:
-            # By severity
-            severity_key = issue.severity.value
-            self.result.issues_by_severity[severity_key] = \
-                self.result.issues_by_severity.get(severity_key, 0) + 1
-            
-            # By type
-            type_key = issue.issue_type.value
-            self.result.issues_by_type[type_key] = \
-                self.result.issues_by_type.get(type_key, 0) + 1
-            
-            # Critical issues
-            if issue.severity == Severity.CRITICAL:
-                self.result.critical_issues.append(issue)
-            
-            # Auto-fixable issues
-            if issue.fixable:
-                self.result.auto_fixable_issues.append(issue)
+        self.result.issues_by_severity = dict(Counter(i.severity.value for i in self.issues))
+        self.result.issues_by_type = dict(Counter(i.issue_type.value for i in self.issues))
+        self.result.critical_issues = [i for i in self.issues if i.severity is Severity.CRITICAL]
+        self.result.auto_fixable_issues = [i for i in self.issues if i.fixable]
         
         # Print summary
         print(f"   Files scanned: {self.result.files_scanned}")
@@ -380,11 +1095,16 @@ def main():
     parser.add_argument('--format', '-f', choices=['json', 'sarif'], default='json',
                         help='Output format')
     parser.add_argument('--project-root', '-p', help='Project directory')
+    parser.add_argument('--no-cache', action='store_true',
+                        help=f'Do not read or write the {CACHE_DIR_NAME} results cache')
+    parser.add_argument('--base-ref',
+                        help='Only lint files changed since the merge base with this git ref')
     
     args = parser.parse_args()
     
     # Create analyzer and run it
-    analyzer = CodeAnalyzer(args.project_root)
+    analyzer = CodeAnalyzer(args.project_root, use_cache=not args.no_cache,
+                            base_ref=args.base_ref)
     result = analyzer.analyze()
     
     # Save results
@@ -392,15 +1112,13 @@ def main():
     output_path.parent.mkdir(parents=True, exist_ok=True)
     
     if args.format == 'json':
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(result.to_dict(), f, indent=2, ensure_ascii=False)
+        output_path.write_bytes(_dump_json(result.to_dict(), indent=True))
         print(f"   Results saved to {output_path}")
     
     # Save critical issues file
     if result.critical_issues:
         critical_path = Path("critical-issues.json")
-        with open(critical_path, 'w', encoding='utf-8') as f:
-            json.dump([i.to_dict() for i in result.critical_issues], f, indent=2, ensure_ascii=False)
+        critical_path.write_bytes(_dump_json(result.critical_issues, indent=True))
         print(f"   Critical issues saved to {critical_path}")
     
     # Return exit code based on critical issues
@@ -1,36 +1,73 @@
-import os
+import asyncio
 import re
-import requests
+from collections import defaultdict
 from pathlib import Path
+from urllib.parse import urldefrag, urlparse
+
+import aiohttp
+
+# Overall concurrency, and the most requests in flight to any one host
+MAX_CONCURRENCY = 64
+MAX_PER_HOST = 4
+TIMEOUT = aiohttp.ClientTimeout(total=5)
+
+# Regex to find URLs, compiled once for every file scanned
+_URL_RE = re.compile(r'https?://[^\s<>"\'`)]+')
 
 def find_links(text):
-    # Regex to find URLs
-    url_pattern = r'http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+'
-    return re.findall(url_pattern, text)
+    # Lazily yield URLs so large files never build a full match list
+    return (m.group(0) for m in _URL_RE.finditer(text))
 
-def check_link(url):
-    try:
-        response = requests.head(url, timeout=5, allow_redirects=True)
-        return response.status_code < 400
-    except:
-        return False
+async def check_link(session, semaphore, host_slots, url):
+    # Host slot is taken first so queued requests don't eat into the timeout
+    async with host_slots[urlparse(url).netloc], semaphore:
+        try:
+            async with session.head(url, timeout=TIMEOUT, allow_redirects=True) as response:
+                status = response.status
+            # Some servers reject HEAD outright
+            if status == 405:
+                async with session.get(url, timeout=TIMEOUT, allow_redirects=True) as response:
+                    status = response.status
+            return status < 400
+        except Exception:
+            return False
+
+async def check_links(urls):
+    urls = list(urls)
+    semaphore = asyncio.Semaphore(MAX_CONCURRENCY)
+    host_slots = defaultdict(lambda: asyncio.Semaphore(MAX_PER_HOST))
+    connector = aiohttp.TCPConnector(limit=MAX_CONCURRENCY, ttl_dns_cache=300)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        results = await asyncio.gather(
+            *(check_link(session, semaphore, host_slots, url) for url in urls)
+        )
+    return dict(zip(urls, results))
 
 def main():
     print("Starting Link Checker...")
     project_root = Path(".")
     files_to_check = list(project_root.glob("**/*.md")) + list(project_root.glob("**/*.html"))
     
-    broken_links = []
+    # Collect every URL once, remembering which files reference it
+    all_links = defaultdict(list)
     for file_path in files_to_check:
         if ".github" in str(file_path) and "scripts" in str(file_path):
             continue
             
         with open(file_path, 'r', encoding='utf-8') as f:
             content = f.read()
-            links = find_links(content)
-            for link in links:
-                if not check_link(link):
-                    broken_links.append((str(file_path), link))
+            for link in find_links(content):
+                all_links[link].append(str(file_path))
+    
+    # Fragments never reach the server, so page#a and page#b share one request
+    targets = {link: urldefrag(link).url for link in all_links}
+    results = asyncio.run(check_links(set(targets.values())))
+    
+    broken_links = [
+        (file, link)
+        for link, files in all_links.items() if not results[targets[link]]
+        for file in files
+    ]
     
     if broken_links:
         print(f"Found {len(broken_links)} broken links:")
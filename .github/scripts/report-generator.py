@@ -5,13 +5,20 @@ Auto-Guardian: Report Generator
 Generate detailed reports about code quality and send appropriate notifications
 """
 
+import io
 import json
+import shutil
 import sys
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 
 class ReportType(Enum):
@@ -41,8 +48,9 @@ class ReportGenerator:
     
     def _load_results(self) -> dict:
         """Load scan results"""
-        with open(self.config.scan_results_file, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        with open(self.config.scan_results_file, 'rb') as f:
+            data = f.read()
+        return orjson.loads(data) if orjson is not None else json.loads(data)
     
     def generate_pull_request_comment(self) -> str:
         """Generate comment for Pull Request"""
@@ -60,78 +68,79 @@ class ReportGenerator:
             'info': 'Info'
         }
         
-        report = []
+        report = io.StringIO()
+        w = report.write
         
         # Title
-        report.append("## Quality Scan Report - Auto-Guardian")
-        report.append("")
-        report.append(f"**Scan Date:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        report.append(f"**Files Scanned:** {summary.get('files_scanned', 0)}")
-        report.append(f"**Total Issues:** {summary.get('total_issues', 0)}")
-        report.append("")
+        w("## Quality Scan Report - Auto-Guardian\n")
+        w("\n")
+        w(f"**Scan Date:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+        w(f"**Files Scanned:** {summary.get('files_scanned', 0)}\n")
+        w(f"**Total Issues:** {summary.get('total_issues', 0)}\n")
+        w("\n")
         
         # Summary by severity
-        report.append("### Issues Summary")
-        report.append("")
-        report.append("| Severity | Count |")
-        report.append("|----------|-------|")
+        w("### Issues Summary\n")
+        w("\n")
+        w("| Severity | Count |\n")
+        w("|----------|-------|\n")
         for severity, count in summary.get('by_severity', {}).items():
             emoji = severity_emojis.get(severity, 'Info')
-            report.append(f"| {emoji} | {count} |")
-        report.append("")
+            w(f"| {emoji} | {count} |\n")
+        w("\n")
         
         # Auto-fix status
         if auto_fixable:
-            report.append("### Auto-Fixes Applied")
-            report.append("")
-            report.append(f"**{len(auto_fixable)}** issues were fixed automatically:")
-            report.append("")
+            w("### Auto-Fixes Applied\n")
+            w("\n")
+            w(f"**{len(auto_fixable)}** issues were fixed automatically:\n")
+            w("\n")
             
             for issue in auto_fixable[:10]:  # Show first 10 only
                 file_path = Path(issue['file']).name
-                report.append(f"- Fixed `{file_path}`:{issue['line']} - {issue['message']}")
+                w(f"- Fixed `{file_path}`:{issue['line']} - {issue['message']}\n")
             
             if len(auto_fixable) > 10:
-                report.append(f"- ... and **{len(auto_fixable) - 10}** more fixes")
-            report.append("")
+                w(f"- ... and **{len(auto_fixable) - 10}** more fixes\n")
+            w("\n")
         
         # Issues requiring human intervention
         if critical_issues:
-            report.append("### Issues Requiring Human Intervention")
-            report.append("")
-            report.append("**This code cannot be merged until these issues are resolved:**")
-            report.append("")
+            w("### Issues Requiring Human Intervention\n")
+            w("\n")
+            w("**This code cannot be merged until these issues are resolved:**\n")
+            w("\n")
             
             for issue in critical_issues:
                 file_path = Path(issue['file']).name
                 emoji = severity_emojis.get(issue['severity'], 'Critical')
-                report.append(f"- **{emoji} {issue['file']}:{issue['line']}**")
-                report.append(f"  - Issue: {issue['message']}")
+                w(f"- **{emoji} {issue['file']}:{issue['line']}**\n")
+                w(f"  - Issue: {issue['message']}\n")
                 if issue.get('suggestion'):
-                    report.append(f"  - Suggestion: {issue['suggestion']}")
-                report.append("")
+                    w(f"  - Suggestion: {issue['suggestion']}\n")
+                w("\n")
             
-            report.append("---")
-            report.append("### Merge Status: Blocked")
-            report.append("")
-            report.append("**This Pull Request is blocked from merging due to critical issues.**")
-            report.append("")
-            report.append("Please resolve the issues above and try again.")
+            w("---\n")
+            w("### Merge Status: Blocked\n")
+            w("\n")
+            w("**This Pull Request is blocked from merging due to critical issues.**\n")
+            w("\n")
+            w("Please resolve the issues above and try again.\n")
         else:
             # No critical issues
-            report.append("---")
-            report.append("### Merge Status: Approved")
-            report.append("")
-            report.append("**This code passed all quality checks!**")
-            report.append("")
-            report.append("You can proceed with merging this Pull Request.")
+            w("---\n")
+            w("### Merge Status: Approved\n")
+            w("\n")
+            w("**This code passed all quality checks!**\n")
+            w("\n")
+            w("You can proceed with merging this Pull Request.\n")
         
         # Footer
-        report.append("")
-        report.append("---")
-        report.append("*Report generated automatically by Auto-Guardian Bot*")
+        w("\n")
+        w("---\n")
+        w("*Report generated automatically by Auto-Guardian Bot*")
         
-        return '\n'.join(report)
+        return report.getvalue()
     
     def generate_daily_summary(self) -> dict:
         """Generate daily summary"""
@@ -154,25 +163,30 @@ class ReportGenerator:
         if not security_issues:
             return None
         
-        alert = []
-        alert.append("Security Alert - Auto-Guardian")
-        alert.append("")
-        alert.append("Security vulnerabilities detected in code:")
-        alert.append("")
+        alert = io.StringIO()
+        w = alert.write
+        w("Security Alert - Auto-Guardian\n")
+        w("\n")
+        w("Security vulnerabilities detected in code:\n")
+        w("\n")
         
         for issue in security_issues:
-            alert.append(f"- {issue['file']}:{issue['line']}")
-            alert.append(f"  {issue['message']}")
+            w(f"- {issue['file']}:{issue['line']}\n")
+            w(f"  {issue['message']}\n")
             if issue.get('suggestion'):
-                alert.append(f"  Suggestion: {issue['suggestion']}")
+                w(f"  Suggestion: {issue['suggestion']}\n")
         
-        return '\n'.join(alert)
+        return alert.getvalue()
     
-    def save_report(self, content: str, filename: str = "report.md") -> Path:
+    def save_report(self, content: Union[str, io.StringIO], filename: str = "report.md") -> Path:
         """Save report to file"""
         output_path = Path(filename)
         with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(content)
+            if isinstance(content, io.StringIO):
+                content.seek(0)
+                shutil.copyfileobj(content, f)
+            else:
+                f.write(content)
         return output_path
 
 